@@ -1,14 +1,19 @@
 """
-Flask Application - PhonePe Insights Analyzer
+Quart Application - PhonePe Insights Analyzer
 Main application file with routes and business logic
 """
 
 import os
-import json
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from quart import Quart, Response, render_template, request, session, redirect, url_for
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import uuid
+import aiofiles.os
+import orjson
 
 # Try to load dotenv, but don't fail if not available
 try:
@@ -17,18 +22,21 @@ try:
 except:
     pass
 
-from pdf_processor import extract_text_from_pdf
+from pdf_processor import PDFProcessor
 from transaction_parser import TransactionParser
 from insights_generator import InsightsGenerator
+from session_store import create_session_store
 
-# Initialize Flask app
-app = Flask(__name__)
+# WARNING by default so per-row debug logging stays a cheap level check
+logging.basicConfig(level=logging.WARNING)
+
+# Initialize Quart app (async, Flask-compatible API)
+app = Quart(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production-vercel-deployment')
 
 # Use /tmp for Vercel serverless functions (writable directory)
 app.config['UPLOAD_FOLDER'] = '/tmp'
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
-app.config['ALLOWED_EXTENSIONS'] = {'pdf'}
 
 # Ensure /tmp exists (it should on Vercel)
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -37,45 +45,108 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 transaction_parser = TransactionParser()
 insights_generator = InsightsGenerator()
 
-# In-memory storage (replace with database in production)
-sessions_data = {}
+# PDF extraction and parsing are CPU-bound, so run them in worker processes
+# to keep the event loop free. Each server worker gets its own pool, so set
+# PDF_WORKERS (default: CPU count) to about CPUs / server workers when running
+# several, e.g. hypercorn --workers 4, to avoid oversubscribing the CPU.
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', 0)) or os.cpu_count()
+
+
+def create_pdf_executor():
+    """Create the PDF worker pool (threads on serverless runtimes without /dev/shm)"""
+    try:
+        return ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    except (OSError, NotImplementedError):
+        return ThreadPoolExecutor(max_workers=PDF_WORKERS)
+
+
+pdf_executor = create_pdf_executor()
+
+# Session data lives in Redis when REDIS_URL is set (shared across workers,
+# expires after SESSION_TTL seconds), otherwise in this process's memory
+session_store = create_session_store()
+
+# Allowed upload extensions, as a tuple for str.endswith
+_ALLOWED_EXTENSIONS = ('.pdf',)
+
+
+def process_statement(filepath, password=None):
+    """
+    Extract and parse a statement page by page (runs in pdf_executor)
+    
+    Each page is parsed as soon as it is extracted, so the full document
+    text is never held in memory at once.
+    """
+    pages = PDFProcessor(filepath, password).iter_pages()
+    return transaction_parser.process_pages(pages)
+
+
+async def run_process_statement(filepath, password=None):
+    """
+    Run process_statement in pdf_executor, replacing the pool if it broke
+    
+    A worker that dies (e.g. OOM-killed on a huge PDF) breaks the whole
+    ProcessPoolExecutor for good, so a broken pool is swapped for a new one
+    and the statement retried once; a second failure fails only this upload.
+    """
+    global pdf_executor
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = pdf_executor
+        try:
+            return await loop.run_in_executor(executor, process_statement, filepath, password)
+        except BrokenProcessPool:
+            # Concurrent uploads see the same broken pool; only the first replaces it
+            if pdf_executor is executor:
+                pdf_executor = create_pdf_executor()
+                executor.shutdown(wait=False)
+            if attempt:
+                raise
 
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    return filename.lower().endswith(_ALLOWED_EXTENSIONS)
+
+
+def fast_jsonify(obj):
+    """JSON response encoded with orjson (much faster on large transaction lists)"""
+    return Response(orjson.dumps(obj), mimetype='application/json')
 
 
 @app.route('/')
-def index():
+async def index():
     """Landing page"""
-    return render_template('index.html')
+    return await render_template('index.html')
 
 
 @app.route('/upload')
-def upload():
+async def upload():
     """Upload screen"""
-    return render_template('upload.html')
+    return await render_template('upload.html')
 
 
 @app.route('/upload', methods=['POST'])
-def upload_file():
+async def upload_file():
     """Handle file upload and processing"""
     try:
+        files = await request.files
+        form = await request.form
+        
         # Check if file is present
-        if 'pdf_file' not in request.files:
-            return jsonify({'error': 'No file uploaded'}), 400
+        if 'pdf_file' not in files:
+            return fast_jsonify({'error': 'No file uploaded'}), 400
         
-        file = request.files['pdf_file']
+        file = files['pdf_file']
         
         if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+            return fast_jsonify({'error': 'No file selected'}), 400
         
         if not allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type. Only PDF files are allowed'}), 400
+            return fast_jsonify({'error': 'Invalid file type. Only PDF files are allowed'}), 400
         
         # Get password if provided
-        password = request.form.get('password', None)
+        password = form.get('password', None)
         if password == '':
             password = None
         
@@ -83,65 +154,63 @@ def upload_file():
         filename = secure_filename(file.filename)
         unique_filename = f"{uuid.uuid4()}_{filename}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(filepath)
+        await file.save(filepath)
         
-        # Extract text from PDF
+        # Extract and parse transactions
         try:
-            raw_text = extract_text_from_pdf(filepath, password)
+            result = await run_process_statement(filepath, password)
         except Exception as e:
-            os.remove(filepath)
-            return jsonify({'error': f'Failed to extract text from PDF: {str(e)}'}), 400
+            await aiofiles.os.remove(filepath)
+            return fast_jsonify({'error': f'Failed to process PDF: {str(e)}'}), 400
         
-        # Process transactions
+        # Generate insights
         try:
-            result = transaction_parser.process_full_pipeline(raw_text)
             transactions = result.get('transactions', [])
             
-            # Generate insights
             if 'insights' not in result or not result['insights']:
                 insights = insights_generator.calculate_insights_manually(transactions)
             else:
                 insights = result['insights']
             
         except Exception as e:
-            os.remove(filepath)
-            return jsonify({'error': f'Failed to process transactions: {str(e)}'}), 500
+            await aiofiles.os.remove(filepath)
+            return fast_jsonify({'error': f'Failed to process transactions: {str(e)}'}), 500
         
         # Store in session
         session_id = str(uuid.uuid4())
-        sessions_data[session_id] = {
+        await session_store.set(session_id, {
             'transactions': transactions,
             'insights': insights,
+            'category_totals': insights_generator.get_category_totals(transactions),
             'filename': filename,
             'upload_time': datetime.now().isoformat()
-        }
+        })
         
         # Clean up file
-        os.remove(filepath)
+        await aiofiles.os.remove(filepath)
         
         # Store session ID
         session['session_id'] = session_id
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'session_id': session_id,
             'redirect': url_for('dashboard')
         })
     
     except Exception as e:
-        return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Unexpected error: {str(e)}'}), 500
 
 
 @app.route('/dashboard')
-def dashboard():
+async def dashboard():
     """Dashboard screen with insights"""
-    session_id = session.get('session_id')
+    data = await session_store.get(session.get('session_id'))
     
-    if not session_id or session_id not in sessions_data:
+    if data is None:
         return redirect(url_for('upload'))
     
-    data = sessions_data[session_id]
-    return render_template(
+    return await render_template(
         'dashboard.html',
         insights=data['insights'],
         transactions=data['transactions'],
@@ -150,14 +219,13 @@ def dashboard():
 
 
 @app.route('/transaction/<int:index>')
-def transaction_detail(index):
+async def transaction_detail(index):
     """Transaction detail screen"""
-    session_id = session.get('session_id')
+    data = await session_store.get(session.get('session_id'))
     
-    if not session_id or session_id not in sessions_data:
+    if data is None:
         return redirect(url_for('upload'))
     
-    data = sessions_data[session_id]
     transactions = data['transactions']
     
     if index < 0 or index >= len(transactions):
@@ -171,7 +239,7 @@ def transaction_detail(index):
         'recharge', 'dining', 'shopping', 'government', 'other'
     ]
     
-    return render_template(
+    return await render_template(
         'transaction_detail.html',
         transaction=transaction,
         index=index,
@@ -180,45 +248,63 @@ def transaction_detail(index):
 
 
 @app.route('/api/update_category', methods=['POST'])
-def update_category():
+async def update_category():
     """Update transaction category"""
     session_id = session.get('session_id')
     
-    if not session_id or session_id not in sessions_data:
-        return jsonify({'error': 'Session expired'}), 401
-    
-    data = request.get_json()
+    data = await request.get_json()
     index = data.get('index')
     new_category = data.get('category')
     
     if index is None or new_category is None:
-        return jsonify({'error': 'Missing parameters'}), 400
-    
-    session_data = sessions_data[session_id]
-    transactions = session_data['transactions']
+        return fast_jsonify({'error': 'Missing parameters'}), 400
     
-    if index < 0 or index >= len(transactions):
-        return jsonify({'error': 'Invalid transaction index'}), 400
+    def apply_update(session_data):
+        transactions = session_data['transactions']
+        
+        if index < 0 or index >= len(transactions):
+            raise IndexError('Invalid transaction index')
+        
+        transaction = transactions[index]
+        old_category = transaction.get('category', 'other')
+        
+        # Sessions saved before category totals were tracked
+        if 'category_totals' not in session_data:
+            session_data['category_totals'] = insights_generator.get_category_totals(transactions)
+        
+        # Update category
+        transaction['category'] = new_category
+        
+        # Only category totals depend on the category, so shift this debit's
+        # amount between them instead of regenerating all insights
+        insights = session_data['insights']
+        if transaction['direction'] == 'debit':
+            category_totals = session_data['category_totals']
+            insights_generator.move_category_amount(
+                category_totals, transaction['amount'], old_category, new_category
+            )
+            insights['top_categories'] = insights_generator.rank_categories(category_totals)
+        return insights
     
-    # Update category
-    transactions[index]['category'] = new_category
+    # Read-modify-write as one atomic update so concurrent edits are not lost
+    try:
+        insights = await session_store.update(session_id, apply_update)
+    except IndexError as e:
+        return fast_jsonify({'error': str(e)}), 400
     
-    # Regenerate insights
-    insights = insights_generator.calculate_insights_manually(transactions)
-    session_data['insights'] = insights
+    if insights is None:
+        return fast_jsonify({'error': 'Session expired'}), 401
     
-    return jsonify({'success': True, 'insights': insights})
+    return fast_jsonify({'success': True, 'insights': insights})
 
 
 @app.route('/api/export')
-def export_data():
+async def export_data():
     """Export transactions as JSON"""
-    session_id = session.get('session_id')
+    data = await session_store.get(session.get('session_id'))
     
-    if not session_id or session_id not in sessions_data:
-        return jsonify({'error': 'Session expired'}), 401
-    
-    data = sessions_data[session_id]
+    if data is None:
+        return fast_jsonify({'error': 'Session expired'}), 401
     
     export = {
         'filename': data['filename'],
@@ -227,36 +313,38 @@ def export_data():
         'insights': data['insights']
     }
     
-    return jsonify(export)
+    return fast_jsonify(export)
 
 
 @app.route('/api/data')
-def get_data():
+async def get_data():
     """Get current session data"""
-    session_id = session.get('session_id')
+    data = await session_store.get(session.get('session_id'))
     
-    if not session_id or session_id not in sessions_data:
-        return jsonify({'error': 'Session expired'}), 401
+    if data is None:
+        return fast_jsonify({'error': 'Session expired'}), 401
     
-    return jsonify(sessions_data[session_id])
+    # category_totals is server-side bookkeeping for update_category. Filter
+    # a copy: the in-memory store returns the stored session itself
+    return fast_jsonify({k: v for k, v in data.items() if k != 'category_totals'})
 
 
 @app.errorhandler(413)
-def too_large(e):
+async def too_large(e):
     """Handle file too large error"""
-    return jsonify({'error': 'File too large. Maximum size is 16MB'}), 413
+    return fast_jsonify({'error': 'File too large. Maximum size is 16MB'}), 413
 
 
 @app.errorhandler(404)
-def not_found(e):
+async def not_found(e):
     """Handle 404 errors"""
-    return render_template('404.html'), 404
+    return await render_template('404.html'), 404
 
 
 @app.errorhandler(500)
-def server_error(e):
+async def server_error(e):
     """Handle 500 errors"""
-    return jsonify({'error': 'Internal server error'}), 500
+    return fast_jsonify({'error': 'Internal server error'}), 500
 
 
 if __name__ == '__main__':
@@ -4,9 +4,63 @@ Generates detailed analytics and insights from transactions
 NO LLM - All processing done locally for privacy
 """
 
-from typing import List, Dict
+import re
+import heapq
+import logging
+from typing import List, Dict, Optional
 from datetime import datetime
 from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+
+
+log = logging.getLogger(__name__)
+
+
+# Sort key for (name, amount) pairs
+_BY_AMOUNT = itemgetter(1)
+
+# Position of each direction in per-direction accumulators
+_DEBIT, _CREDIT = 0, 1
+_DIRECTION_INDEX = {'debit': _DEBIT, 'credit': _CREDIT}
+
+# Numeric dates: yyyy-mm-dd or dd-mm-yyyy / dd-mm-yy with a consistent
+# '-', '/' or '.' separator
+_DATE_RE = re.compile(r'^(\d{1,4})([-/.])(\d{1,2})\2(\d{1,4})$')
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """
+    Parse a transaction date, returning None if the format is not recognised
+    
+    Accepts ISO dates plus yyyy-mm-dd, dd-mm-yyyy, dd/mm/yyyy, dd.mm.yyyy,
+    dd-mm-yy and dd/mm/yy. Cached because statements repeat the same dates.
+    """
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
+    
+    match = _DATE_RE.match(date_str)
+    if not match:
+        return None
+    
+    first, sep, month, last = match.groups()
+    if len(first) == 4 and sep == '-' and len(last) <= 2:
+        year, day = int(first), int(last)
+    elif len(first) <= 2 and len(last) == 4:
+        year, day = int(last), int(first)
+    elif len(first) <= 2 and len(last) == 2 and sep != '.':
+        # Same pivot as strptime's %y
+        year, day = int(last) + (2000 if int(last) < 69 else 1900), int(first)
+    else:
+        return None
+    
+    try:
+        return datetime(year, int(month), day)
+    except ValueError:
+        return None
 
 
 class InsightsGenerator:
@@ -40,112 +94,79 @@ class InsightsGenerator:
         if not transactions:
             return self._empty_insights()
         
-        # Basic totals
-        total_debit = sum(t['amount'] for t in transactions if t['direction'] == 'debit')
-        total_credit = sum(t['amount'] for t in transactions if t['direction'] == 'credit')
-        net_flow = total_credit - total_debit
-        
-        # Top categories
+        # Single pass: split by direction and accumulate every debit aggregate
+        debits = []
+        amounts_by_direction = ([], [])
         category_totals = defaultdict(float)
+        merchant_totals = defaultdict(float)
+        daily_spend = defaultdict(float)
+        monthly_spend = defaultdict(float)
+        
         for t in transactions:
-            if t['direction'] == 'debit':
-                category_totals[t.get('category', 'other')] += t['amount']
+            # One dict lookup per row instead of comparing direction strings
+            code = _DIRECTION_INDEX.get(t['direction'])
+            if code is None:
+                continue
+            
+            amount = t['amount']
+            amounts_by_direction[code].append(amount)
+            if code == _CREDIT:
+                continue
+            
+            debits.append(t)
+            category_totals[t.get('category', 'other')] += amount
+            merchant_totals[t.get('merchant', 'Unknown')] += amount
+            
+            if t.get('date'):
+                try:
+                    date_obj = _parse_date(t['date'])
+                    if date_obj:
+                        # isoformat() starts with yyyy-mm-dd, so slice instead of strftime
+                        day_key = date_obj.isoformat()[:10]
+                        daily_spend[day_key] += amount
+                        monthly_spend[day_key[:7]] += amount
+                except Exception as e:
+                    log.debug("date parse failed: %s %s", t.get('date'), e)
         
-        top_categories = [
-            {'category': cat, 'total_amount': round(amt, 2)}
-            for cat, amt in sorted(category_totals.items(), key=lambda x: x[1], reverse=True)
-        ]
+        debit_amounts = amounts_by_direction[_DEBIT]
+        credit_amounts = amounts_by_direction[_CREDIT]
         
-        # Top merchants
-        merchant_totals = defaultdict(float)
-        for t in transactions:
-            if t['direction'] == 'debit':
-                merchant_totals[t.get('merchant', 'Unknown')] += t['amount']
+        # Basic totals
+        total_debit = sum(debit_amounts)
+        total_credit = sum(credit_amounts)
+        net_flow = total_credit - total_debit
+        
+        # Sort only the final aggregates
+        top_categories = self.rank_categories(category_totals)
         
         top_merchants = [
             {'merchant': merch, 'total_amount': round(amt, 2)}
-            for merch, amt in sorted(merchant_totals.items(), key=lambda x: x[1], reverse=True)[:10]
+            for merch, amt in heapq.nlargest(10, merchant_totals.items(), key=_BY_AMOUNT)
         ]
         
-        # Daily spend trend
-        daily_spend = defaultdict(float)
-        for t in transactions:
-            if t['direction'] == 'debit' and t.get('date'):
-                try:
-                    # Try to parse the date - handle multiple formats
-                    date_str = t['date']
-                    date_obj = None
-                    
-                    # Try ISO format first
-                    try:
-                        date_obj = datetime.fromisoformat(date_str)
-                    except:
-                        # Try other common formats
-                        for fmt in ['%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y', '%d-%m-%y', '%d/%m/%y']:
-                            try:
-                                date_obj = datetime.strptime(date_str, fmt)
-                                break
-                            except:
-                                continue
-                    
-                    if date_obj:
-                        day_key = date_obj.strftime('%Y-%m-%d')
-                        daily_spend[day_key] += t['amount']
-                except Exception as e:
-                    print(f"Error parsing date '{t.get('date')}': {e}")
-                    pass
-        
         daily_spend_trend = [
             {'day': day, 'total_amount': round(amt, 2)}
             for day, amt in sorted(daily_spend.items())
         ]
         
-        # Monthly spend trend
-        monthly_spend = defaultdict(float)
-        for t in transactions:
-            if t['direction'] == 'debit' and t.get('date'):
-                try:
-                    # Try to parse the date - handle multiple formats
-                    date_str = t['date']
-                    date_obj = None
-                    
-                    # Try ISO format first
-                    try:
-                        date_obj = datetime.fromisoformat(date_str)
-                    except:
-                        # Try other common formats
-                        for fmt in ['%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y', '%d-%m-%y', '%d/%m/%y']:
-                            try:
-                                date_obj = datetime.strptime(date_str, fmt)
-                                break
-                            except:
-                                continue
-                    
-                    if date_obj:
-                        month_key = date_obj.strftime('%Y-%m')
-                        monthly_spend[month_key] += t['amount']
-                except:
-                    pass
-        
         monthly_spend_trend = [
             {'month': month, 'total_amount': round(amt, 2)}
             for month, amt in sorted(monthly_spend.items())
         ]
         
         # Anomalies (transactions > 2x average)
-        debit_amounts = [t['amount'] for t in transactions if t['direction'] == 'debit']
-        avg_debit = sum(debit_amounts) / len(debit_amounts) if debit_amounts else 0
+        avg_debit = total_debit / len(debit_amounts) if debit_amounts else 0
         threshold = avg_debit * 2
         
         anomalies = [
             {
                 'date': t.get('date'),
                 'merchant': t.get('merchant'),
-                'amount': t['amount'],
-                'reason': f'Amount {round(t["amount"] / avg_debit, 1)}x higher than average'
+                'amount': amount,
+                'reason': f'Amount {round(amount / avg_debit, 1)}x higher than average'
             }
-            for t in transactions
-            if t['direction'] == 'debit' and t['amount'] > threshold
+            for t, amount in zip(debits, debit_amounts)
+            if amount > threshold
         ]
         
         return {
@@ -158,11 +179,49 @@ class InsightsGenerator:
             'monthly_spend_trend': monthly_spend_trend,
             'anomalies': anomalies,
             'transaction_count': len(transactions),
-            'debit_count': sum(1 for t in transactions if t['direction'] == 'debit'),
-            'credit_count': sum(1 for t in transactions if t['direction'] == 'credit'),
+            'debit_count': len(debits),
+            'credit_count': len(credit_amounts),
             'average_debit': round(avg_debit, 2) if avg_debit > 0 else 0,
         }
     
+    def get_category_totals(self, transactions: List[Dict]) -> Dict[str, float]:
+        """Total debit amount per category"""
+        category_totals = defaultdict(float)
+        for t in transactions:
+            if t['direction'] == 'debit':
+                category_totals[t.get('category', 'other')] += t['amount']
+        return dict(category_totals)
+    
+    def rank_categories(self, category_totals: Dict[str, float]) -> List[Dict]:
+        """Build the top_categories list, highest spend first"""
+        return [
+            {'category': cat, 'total_amount': round(amt, 2)}
+            for cat, amt in sorted(category_totals.items(), key=_BY_AMOUNT, reverse=True)
+        ]
+    
+    def move_category_amount(self, category_totals: Dict[str, float], amount: float,
+                             old_category: str, new_category: str) -> None:
+        """
+        Update category totals in place after one debit changes category
+        
+        Args:
+            category_totals: Totals from get_category_totals
+            amount: Amount of the recategorized debit
+            old_category: Category before the change
+            new_category: Category after the change
+        """
+        if old_category == new_category:
+            return
+        
+        remaining = category_totals.get(old_category, 0.0) - amount
+        # Debit amounts are always positive, so nothing left means no debits left
+        if round(remaining, 2) > 0:
+            category_totals[old_category] = remaining
+        else:
+            category_totals.pop(old_category, None)
+        
+        category_totals[new_category] = category_totals.get(new_category, 0.0) + amount
+    
     def _empty_insights(self) -> Dict:
         """Return empty insights structure"""
         return {
@@ -5,14 +5,56 @@ Handles communication with OpenAI or Anthropic APIs
 
 import os
 import json
+import asyncio
+import orjson
+from importlib.util import find_spec
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 
+from prompts import get_categorization_messages
+
 load_dotenv()
 
 
+# Shared HTTP connection pools for the OpenAI SDK clients
+_http_client = None
+_async_http_client = None
+
+
+def _http_client_options() -> Dict:
+    """Keep-alive pool settings, using HTTP/2 only if the optional h2 package is installed"""
+    import httpx
+    return {
+        'http2': find_spec('h2') is not None,
+        'limits': httpx.Limits(max_keepalive_connections=20)
+    }
+
+
+def _get_http_client():
+    """Get or create the pooled keep-alive HTTP client"""
+    global _http_client
+    if _http_client is None:
+        import httpx
+        _http_client = httpx.Client(**_http_client_options())
+    return _http_client
+
+
+def _get_async_http_client():
+    """Get or create the pooled keep-alive async HTTP client"""
+    global _async_http_client
+    if _async_http_client is None:
+        import httpx
+        _async_http_client = httpx.AsyncClient(**_http_client_options())
+    return _async_http_client
+
+
 class LLMClient:
-    """Unified client for LLM providers"""
+    """
+    Unified client for LLM providers
+    
+    Construct through get_llm_client() so the provider client, and its
+    pooled connections, are created once rather than per request.
+    """
     
     def __init__(self, provider: str = None, model: str = None):
         self.provider = provider or os.getenv('LLM_PROVIDER', 'openai')
@@ -20,10 +62,20 @@ class LLMClient:
         
         if self.provider == 'openai':
             import openai
-            self.client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            self.client = openai.OpenAI(
+                api_key=os.getenv('OPENAI_API_KEY'),
+                http_client=_get_http_client()
+            )
+            self.aclient = openai.AsyncOpenAI(
+                api_key=os.getenv('OPENAI_API_KEY'),
+                http_client=_get_async_http_client()
+            )
         elif self.provider == 'anthropic':
             import anthropic
+            # The Anthropic SDK pools its own connections; reusing this
+            # instance through get_llm_client() keeps them alive
             self.client = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+            self.aclient = anthropic.AsyncAnthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
     
@@ -43,29 +95,73 @@ class LLMClient:
         elif self.provider == 'anthropic':
             return self._anthropic_completion(messages, temperature)
     
-    def _openai_completion(self, messages: List[Dict[str, str]], temperature: float) -> str:
-        """OpenAI completion"""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=temperature,
-            response_format={"type": "json_object"} if "json" in messages[0].get('content', '').lower() else None
+    async def achat_completion(self, messages: List[Dict[str, str]], temperature: float = 0.1) -> str:
+        """
+        Async version of chat_completion, so several requests can be in flight at once
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0-1)
+            
+        Returns:
+            Response content as string
+        """
+        if self.provider == 'openai':
+            response = await self.aclient.chat.completions.create(
+                **self._openai_request(messages, temperature)
+            )
+            return response.choices[0].message.content
+        elif self.provider == 'anthropic':
+            response = await self.aclient.messages.create(
+                **self._anthropic_request(messages, temperature)
+            )
+            return response.content[0].text
+    
+    async def acategorize_batches(self, batches: List[List[Dict]]) -> List[str]:
+        """
+        Categorize several chunks of transactions concurrently
+        
+        Args:
+            batches: Lists of transactions, one request per list
+            
+        Returns:
+            Raw response for each batch, in the same order
+        """
+        return await asyncio.gather(
+            *(self.achat_completion(get_categorization_messages(b)) for b in batches)
         )
-        return response.choices[0].message.content
     
-    def _anthropic_completion(self, messages: List[Dict[str, str]], temperature: float) -> str:
-        """Anthropic completion"""
+    def _openai_request(self, messages: List[Dict[str, str]], temperature: float) -> Dict:
+        """Keyword arguments for an OpenAI chat completion"""
+        return {
+            'model': self.model,
+            'messages': messages,
+            'temperature': temperature,
+            'response_format': {"type": "json_object"} if "json" in messages[0].get('content', '').lower() else None
+        }
+    
+    def _anthropic_request(self, messages: List[Dict[str, str]], temperature: float) -> Dict:
+        """Keyword arguments for an Anthropic messages request"""
         # Convert messages format
         system_msg = next((m['content'] for m in messages if m['role'] == 'system'), None)
         user_messages = [m for m in messages if m['role'] != 'system']
         
-        response = self.client.messages.create(
-            model=self.model if 'claude' in self.model else 'claude-3-opus-20240229',
-            max_tokens=4096,
-            temperature=temperature,
-            system=system_msg,
-            messages=user_messages
-        )
+        return {
+            'model': self.model if 'claude' in self.model else 'claude-3-opus-20240229',
+            'max_tokens': 4096,
+            'temperature': temperature,
+            'system': system_msg,
+            'messages': user_messages
+        }
+    
+    def _openai_completion(self, messages: List[Dict[str, str]], temperature: float) -> str:
+        """OpenAI completion"""
+        response = self.client.chat.completions.create(**self._openai_request(messages, temperature))
+        return response.choices[0].message.content
+    
+    def _anthropic_completion(self, messages: List[Dict[str, str]], temperature: float) -> str:
+        """Anthropic completion"""
+        response = self.client.messages.create(**self._anthropic_request(messages, temperature))
         return response.content[0].text
     
     def extract_json(self, text: str) -> dict:
@@ -81,10 +177,10 @@ class LLMClient:
             text = '\n'.join(lines[1:-1]) if len(lines) > 2 else text
             text = text.replace('```json', '').replace('```', '')
         
-        # Try to parse JSON
+        # Try to parse JSON (orjson for the common well-formed case)
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
             # Try to find JSON object in text
             start = text.find('{')
             end = text.rfind('}') + 1
@@ -105,7 +201,7 @@ _llm_client = None
 
 
 def get_llm_client() -> LLMClient:
-    """Get or create LLM client singleton"""
+    """Get or create LLM client singleton (the only place LLMClient should be built)"""
     global _llm_client
     if _llm_client is None:
         _llm_client = LLMClient()
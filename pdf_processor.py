@@ -6,7 +6,20 @@ Handles PDF extraction with password support
 import PyPDF2
 import pdfplumber
 import io
-from typing import Optional
+from typing import Iterator, Optional
+
+
+# Words that appear throughout PhonePe statements; if PyPDF2's text has
+# them it decoded the page properly and pdfplumber isn't needed
+_STATEMENT_TOKENS = ('upi', 'paid', 'received')
+
+
+def _looks_like_statement(text: Optional[str], min_length: int) -> bool:
+    """Check that extracted text is long enough and contains statement wording"""
+    if not text or len(text.strip()) <= min_length:
+        return False
+    text_lower = text.lower()
+    return any(token in text_lower for token in _STATEMENT_TOKENS)
 
 
 class PDFProcessor:
@@ -21,7 +34,17 @@ class PDFProcessor:
         Extract text from PDF using multiple methods
         Returns concatenated text from all pages
         """
-        # Try pdfplumber first (better for tables)
+        # Try PyPDF2 first: much cheaper than pdfplumber's layout analysis
+        # and enough for text-only statements
+        pypdf2_text = None
+        try:
+            pypdf2_text = self._extract_with_pypdf2()
+            if _looks_like_statement(pypdf2_text, min_length=500):
+                return pypdf2_text
+        except Exception as e:
+            print(f"PyPDF2 failed: {e}")
+        
+        # Escalate to pdfplumber (better for tables)
         try:
             text = self._extract_with_pdfplumber()
             if text and len(text.strip()) > 100:
@@ -29,39 +52,96 @@ class PDFProcessor:
         except Exception as e:
             print(f"pdfplumber failed: {e}")
         
-        # Fallback to PyPDF2
+        # Fall back to whatever PyPDF2 found
+        if pypdf2_text and len(pypdf2_text.strip()) > 100:
+            return pypdf2_text
+            
+        raise ValueError("Could not extract text from PDF")
+    
+    def iter_pages(self) -> Iterator[str]:
+        """
+        Yield the text of each page in order, without holding the whole document
+        Streams PyPDF2 if its first page reads like a statement, otherwise
+        pdfplumber, falling back to PyPDF2 if it fails before producing text
+        """
+        # Fast path for text-only statements, decided from the first page
+        fast_pages = self._iter_pypdf2_pages()
         try:
-            text = self._extract_with_pypdf2()
-            if text and len(text.strip()) > 100:
-                return text
+            first_page = next(fast_pages, '')
         except Exception as e:
             print(f"PyPDF2 failed: {e}")
+            first_page = ''
+        
+        if _looks_like_statement(first_page, min_length=100):
+            yield first_page
+            yield from fast_pages
+            return
+        fast_pages.close()
+        
+        methods = [
+            ('pdfplumber', self._iter_pdfplumber_pages),
+            ('PyPDF2', self._iter_pypdf2_pages),
+        ]
+        
+        for name, iter_method in methods:
+            produced_text = False
+            try:
+                for page_text in iter_method():
+                    if page_text.strip():
+                        produced_text = True
+                        yield page_text
+            except Exception as e:
+                # Pages already handed to the caller can't be taken back
+                if produced_text:
+                    raise
+                print(f"{name} failed: {e}")
             
+            if produced_text:
+                return
+        
         raise ValueError("Could not extract text from PDF")
     
     def _extract_with_pdfplumber(self) -> str:
         """Extract using pdfplumber (better for structured data)"""
-        text_parts = []
+        # Write straight into one buffer instead of collecting parts to join
+        buf = io.StringIO()
+        for page_text in self._iter_pdfplumber_pages():
+            buf.write(page_text)
         
+        return buf.getvalue()
+    
+    def _iter_pdfplumber_pages(self) -> Iterator[str]:
+        """Yield each page's text and table rows using pdfplumber"""
         with pdfplumber.open(self.file_path, password=self.password) as pdf:
             for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-                
-                # Try to extract tables separately
-                tables = page.extract_tables()
-                for table in tables:
-                    for row in table:
-                        if row:
-                            text_parts.append(" | ".join([str(cell) if cell else "" for cell in row]))
+                buf = io.StringIO()
+                self._extract_one_page(page, buf)
+                yield buf.getvalue()
+    
+    def _extract_one_page(self, page, buf: io.StringIO) -> None:
+        """Write one pdfplumber page's text and table rows to buf"""
+        page_text = page.extract_text()
+        if page_text:
+            buf.write(page_text)
+            buf.write("\n")
+        
+        # Try to extract tables separately
+        tables = page.extract_tables()
+        for table in tables:
+            for row in table:
+                if row:
+                    buf.write(" | ".join(str(cell) if cell else "" for cell in row))
+                    buf.write("\n")
         
-        return "\n".join(text_parts)
+        # Drop the parsed layout so finished pages don't pile up in memory
+        page.flush_cache()
     
     def _extract_with_pypdf2(self) -> str:
         """Extract using PyPDF2 (fallback method)"""
-        text_parts = []
-        
+        return "\n".join(self._iter_pypdf2_pages())
+    
+    def _iter_pypdf2_pages(self) -> Iterator[str]:
+        """Yield each page's text using PyPDF2"""
         with open(self.file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
             
@@ -76,9 +156,7 @@ class PDFProcessor:
             for page in reader.pages:
                 page_text = page.extract_text()
                 if page_text:
-                    text_parts.append(page_text)
-        
-        return "\n".join(text_parts)
+                    yield page_text
     
     def get_metadata(self) -> dict:
         """Extract PDF metadata"""
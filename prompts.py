@@ -2,6 +2,8 @@
 AI System Prompts for PhonePe Transaction Analysis
 """
 
+import orjson
+
 EXTRACTION_PROMPT = """You are a financial data extraction engine. Your input is OCR or text extracted from a PhonePe transaction PDF. The text may contain inconsistent spacing, missing fields, or formatting noise. Your job is to extract structured transaction records.
 
 For each transaction, extract:
@@ -69,35 +71,41 @@ Return response JSON with:
 Return only JSON. Zero explanation. Zero commentary. No markdown."""
 
 
+# System messages are identical on every call, so build them once.
+# Treat them as read-only: they are shared by every message list.
+_EXTRACTION_SYSTEM = {"role": "system", "content": EXTRACTION_PROMPT}
+_CATEGORIZATION_SYSTEM = {"role": "system", "content": CATEGORIZATION_PROMPT}
+_INSIGHTS_SYSTEM = {"role": "system", "content": INSIGHTS_PROMPT}
+_PIPELINE_SYSTEM = {"role": "system", "content": PIPELINE_PROMPT}
+
+
 def get_extraction_messages(raw_text):
     """Generate messages for transaction extraction"""
     return [
-        {"role": "system", "content": EXTRACTION_PROMPT},
+        _EXTRACTION_SYSTEM,
         {"role": "user", "content": f"Extract transactions from this text:\n\n{raw_text}"}
     ]
 
 
 def get_categorization_messages(transactions):
     """Generate messages for transaction categorization"""
-    import json
     return [
-        {"role": "system", "content": CATEGORIZATION_PROMPT},
-        {"role": "user", "content": json.dumps(transactions)}
+        _CATEGORIZATION_SYSTEM,
+        {"role": "user", "content": orjson.dumps(transactions).decode()}
     ]
 
 
 def get_insights_messages(transactions):
     """Generate messages for insights generation"""
-    import json
     return [
-        {"role": "system", "content": INSIGHTS_PROMPT},
-        {"role": "user", "content": json.dumps(transactions)}
+        _INSIGHTS_SYSTEM,
+        {"role": "user", "content": orjson.dumps(transactions).decode()}
     ]
 
 
 def get_pipeline_messages(raw_text):
     """Generate messages for end-to-end pipeline"""
     return [
-        {"role": "system", "content": PIPELINE_PROMPT},
+        _PIPELINE_SYSTEM,
         {"role": "user", "content": f"Process this PhonePe statement:\n\n{raw_text}"}
     ]
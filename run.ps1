@@ -22,7 +22,7 @@ if (!(Test-Path ".env")) {
 # Start the application
 Write-Host ""
 Write-Host "========================================" -ForegroundColor Cyan
-Write-Host "Starting Flask Application..." -ForegroundColor Cyan
+Write-Host "Starting Quart Application..." -ForegroundColor Cyan
 Write-Host "========================================" -ForegroundColor Cyan
 Write-Host ""
 Write-Host "Access the app at: http://localhost:5000" -ForegroundColor Green
@@ -0,0 +1,107 @@
+"""
+Session Store Module
+Holds per-session transactions and insights, in Redis when configured
+"""
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+
+
+class SessionStore:
+    """Session data backed by Redis, or an in-process dict if no Redis URL is set"""
+    
+    def __init__(self, redis_url: Optional[str] = None, ttl: int = 3600):
+        self.ttl = ttl
+        self._redis = None
+        self._local = {}
+        
+        if redis_url:
+            import redis.asyncio as redis
+            self._redis = redis.Redis.from_url(redis_url)
+    
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f'sess:{session_id}'
+    
+    async def get(self, session_id: Optional[str]) -> Optional[Dict]:
+        """
+        Load session data
+        
+        Args:
+            session_id: ID stored in the user's cookie session
+        
+        Returns:
+            Session data dictionary, or None if missing or expired
+        """
+        if not session_id:
+            return None
+        
+        if self._redis is None:
+            return self._local.get(session_id)
+        
+        raw = await self._redis.get(self._key(session_id))
+        return orjson.loads(raw) if raw else None
+    
+    async def set(self, session_id: str, data: Dict) -> None:
+        """Save session data, resetting its expiry"""
+        if self._redis is None:
+            self._local[session_id] = data
+            return
+        
+        await self._redis.set(self._key(session_id), orjson.dumps(data), ex=self.ttl)
+    
+    async def update(self, session_id: Optional[str], mutate: Callable[[Dict], Any]) -> Any:
+        """
+        Atomically read, change and save session data
+        
+        With Redis the read-modify-write runs under WATCH/MULTI and is retried
+        if another request saved the session in between, so concurrent edits
+        are not lost. The in-memory store mutates its dict without awaiting,
+        which is already atomic within the event loop.
+        
+        Args:
+            session_id: ID stored in the user's cookie session
+            mutate: Changes the data in place and returns a result; an
+                exception leaves the stored session untouched
+        
+        Returns:
+            Whatever mutate returned, or None if the session is missing or expired
+        """
+        if not session_id:
+            return None
+        
+        if self._redis is None:
+            data = self._local.get(session_id)
+            return None if data is None else mutate(data)
+        
+        from redis.exceptions import WatchError
+        
+        key = self._key(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    if not raw:
+                        return None
+                    
+                    data = orjson.loads(raw)
+                    result = mutate(data)
+                    
+                    pipe.multi()
+                    pipe.set(key, orjson.dumps(data), ex=self.ttl)
+                    await pipe.execute()
+                    return result
+                except WatchError:
+                    # Saved by another request since WATCH; redo on fresh data
+                    continue
+
+
+def create_session_store() -> SessionStore:
+    """Create the session store from REDIS_URL / SESSION_TTL environment variables"""
+    return SessionStore(
+        redis_url=os.getenv('REDIS_URL'),
+        ttl=int(os.getenv('SESSION_TTL', 3600))
+    )
@@ -5,6 +5,8 @@ Run this after installing dependencies to check if everything is configured corr
 
 import sys
 import os
+from importlib import import_module
+from importlib.util import find_spec
 
 def test_python_version():
     """Test Python version"""
@@ -19,25 +21,23 @@ def test_python_version():
 def test_dependencies():
     """Test if all dependencies are installed"""
     required = [
-        'flask',
+        'quart',
         'PyPDF2',
         'pdfplumber',
         'dotenv',
         'werkzeug',
-        'PIL'
+        'PIL',
+        'orjson',
+        'aiofiles',
+        'hypercorn'
     ]
     
     missing = []
     for package in required:
-        try:
-            if package == 'dotenv':
-                __import__('dotenv')
-            elif package == 'PIL':
-                __import__('PIL')
-            else:
-                __import__(package)
+        # find_spec locates the package without executing it
+        if find_spec(package) is not None:
             print(f"✓ {package}: OK")
-        except ImportError:
+        else:
             print(f"✗ {package}: MISSING")
             missing.append(package)
     
@@ -101,12 +101,16 @@ def test_modules():
         'pdf_processor',
         'transaction_parser',
         'insights_generator',
+        'session_store',
         'app'
     ]
     
     for module in modules:
         try:
-            __import__(module)
+            if find_spec(module) is None:
+                raise ImportError(f"No module named '{module}'")
+            # Import to catch errors in the module body
+            import_module(module)
             print(f"✓ {module}: OK")
         except Exception as e:
             print(f"✗ {module}: FAIL - {str(e)}")
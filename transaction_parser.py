@@ -4,15 +4,98 @@ Handles transaction extraction and categorization using rule-based logic
 NO LLM - All processing done locally for privacy
 """
 
-import json
 import re
-from typing import List, Dict
-from datetime import datetime
+import sys
+import logging
+from dataclasses import dataclass, fields
+from typing import Iterable, List, Dict, Optional, Tuple
+from functools import lru_cache
+
+log = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Deletes every Latin-1 character except ASCII digits and '.', for amount cleanup.
+# Amounts come from the amount regex, so they never contain anything wider.
+_AMOUNT_KEEP = str.maketrans('', '', ''.join(
+    chr(c) for c in range(256) if chr(c) not in '0123456789.'
+))
+
+# Maps the whitespace re's \s matches but RE2's ASCII-only \s does not
+# (\v, NBSP, thin space, ...) to ' ', so RE2 scans see the spacing re would
+_RE2_SPACES = {c: ' ' for c in range(0x3001)
+               if chr(c).isspace() and chr(c) not in '\t\n\f\r '}
+
+# Header/footer lines dropped before parsing
+_NOISE_LINES = frozenset(('phonepe', 'statement', 'transaction history', 'page'))
+
+# Line prefixes that mark a field label rather than a merchant name
+_LABEL_PREFIXES = ('date', 'time', 'amount', 'status', 'transaction', 'upi', 'ref', 'utr', 'debited', 'credited')
+
+# Defaults used by _validate_transaction for required fields left as None
+_REQUIRED_DEFAULTS = (('date', ''), ('merchant', ''), ('direction', 'debit'), ('amount', 0.0))
+
+# Numeric date and time shapes accepted by _normalize_date / _normalize_time.
+# They mirror what the old strptime formats accepted, so no format loop is needed:
+# dd-mm-yyyy, dd/mm/yyyy, dd-mm-yy, dd/mm/yy (one separator throughout) and yyyy-mm-dd
+_RE_DMY = re.compile(r'^(\d{1,2})([-/])(\d{1,2})\2(\d{4}|\d{2})$')
+_RE_YMD = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2}| \d)$')
+# %I:%M[:%S] %p (whitespace required before AM/PM) and %H:%M[:%S]
+_RE_TIME_12H = re.compile(r'^(1[0-2]|0[1-9]|[1-9]):([0-5]\d|\d)(?::(?:[0-5]\d|\d))?\s+(AM|PM)$')
+_RE_TIME_24H = re.compile(r'^(2[0-3]|[01]\d|\d):([0-5]\d|\d)(?::(?:[0-5]\d|\d))?$')
+
+
+# slots=True needs Python 3.10; older interpreters get a regular dataclass
+@dataclass(**({'slots': True} if sys.version_info >= (3, 10) else {}))
+class Transaction:
+    """One parsed transaction; converted to a dict with to_dict() at the API boundary"""
+    date: Optional[str] = None
+    time: Optional[str] = None
+    merchant: Optional[str] = None
+    direction: str = 'debit'
+    amount: float = 0.0
+    transaction_id: Optional[str] = None
+    utr_number: Optional[str] = None
+    account_reference: Optional[str] = None
+    category: str = 'other'
+    
+    def to_dict(self) -> Dict:
+        """Plain dict in field order (shallow, unlike dataclasses.asdict)"""
+        return {name: getattr(self, name) for name in _TRANSACTION_FIELDS}
+
+
+_TRANSACTION_FIELDS = tuple(f.name for f in fields(Transaction))
+
+
+def _compile_scan_pattern(pattern: str, flags: int = 0):
+    """
+    Compile a hot-path scan pattern with RE2 when it is installed
+    
+    RE2 matches in linear time without backtracking. Falls back to the
+    standard re module if google-re2 is missing or rejects the pattern.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile('(?i)' + pattern if flags & re.IGNORECASE else pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
 
 
 class TransactionParser:
     """Parse and categorize transactions from raw text using pattern matching"""
     
+    # Maximum number of lines, starting at its date, that one transaction spans
+    TRANSACTION_WINDOW = 10
+    
     def __init__(self):
         # Category keywords mapping
         self.category_keywords = {
@@ -25,8 +108,103 @@ class TransactionParser:
             'government': ['government', 'tax', 'challan', 'municipal', 'electricity', 'water', 'bill', 'lic', 'insurance'],
             'personal_transfer': ['transfer', 'upi', 'sent to', 'received from', 'wallet'],
         }
+        
+        # Regexes used on every scanned line, compiled once per parser
+        page_pattern = r'(?:page|pg)\s+\d+\s+of\s+\d+|^\d+\s+of\s+\d+$'
+        # One date pattern covers every layout. Specializing it per statement was
+        # measured: proving a layout absent takes a full-text regex pass that
+        # costs as much as the per-line date scan it would speed up, and header
+        # fingerprints are unsafe because statements can mix layouts
+        date_pattern = r'\b(\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})\b'
+        time_pattern = r'\b(\d{1,2}:\d{2}(?::\d{2})?(?:\s*[AP]M)?)\b'
+        # More flexible amount pattern
+        amount_pattern = r'(?:Rs\.?|INR|₹|Amount[:\s]*)\s*([0-9,]+(?:\.[0-9]{1,2})?)|([0-9,]+(?:\.[0-9]{1,2})?)\s*(?:Rs\.?|INR|₹)'
+        
+        self._re_page = re.compile(page_pattern, re.IGNORECASE)
+        self._re_date = re.compile(date_pattern)
+        self._re_time = re.compile(time_pattern)
+        # Amount, transaction ID and UTR go through RE2 when available: their
+        # optional prefixes and digit runs backtrack polynomially under re
+        # (a window of 2,000 spaces takes ~20s in the UTR pattern)
+        self._re_amount = _compile_scan_pattern(amount_pattern, re.IGNORECASE)
+        self._re_txn_id = _compile_scan_pattern(r'(?:transaction|txn|trans|ref)\s*(?:id|no|number)?\s*[:=#]?\s*([A-Z0-9]{10,})', re.IGNORECASE)
+        self._re_utr = _compile_scan_pattern(r'(?:utr|ref\s*no)?\s*[:=#]?\s*([0-9]{12,})', re.IGNORECASE)
+        self._re_account = re.compile(r'(?:account|a/c)?\s*(?:xxxx|x{4})?(\d{4})', re.IGNORECASE)
+        
+        # Invalid merchant patterns to skip, as one alternation
+        invalid_patterns = [
+            r'^\d{1,2}:\d{2}\s*(am|pm)',  # Time stamps like "10:21 PM"
+            r'^(transaction|txn|trans)\s*(id|no|number)',  # "Transaction ID"
+            r'^(utr|ref)\s*(no|number)',  # "UTR No"
+            r'^(debited|credited)\s*(from|to)',  # "Debited from"
+            r'^xx\d+',  # Account numbers like "XX7875"
+            r'^\d+$',  # Just numbers
+            r'^[a-z]{1,3}$',  # Single short words
+        ]
+        self._re_invalid_merchant = re.compile('|'.join(f'(?:{p})' for p in invalid_patterns), re.IGNORECASE)
+        
+        # Keywords that indicate merchant name (expanded list), in priority order
+        self._merchant_indicators = (
+            'to:', 'to ', 'merchant:', 'from:', 'recipient:', 'payee:', 
+            'paid to:', 'sent to:', 'received from:', 'transfer to:',
+            'payment to:', 'money sent to:'
+        )
+        # Cheap gate: lines containing none of the indicators skip the ordered scan
+        self._re_merchant_indicator = re.compile('|'.join(map(re.escape, self._merchant_indicators)))
+        self._re_status_suffix = re.compile(r'\s*(success|completed|failed|pending).*$', re.IGNORECASE)
+        self._re_whitespace = re.compile(r'\s+')
+        self._re_numbers_only = re.compile(r'^[\d\s:/-]+$')
+        self._re_word = re.compile(r'[a-zA-Z]{3,}')
+        
+        self._categories = list(self.category_keywords)
+        self._keyword_automaton = self._build_keyword_automaton()
+        # Per-parser cache, since the result depends on this instance's keywords
+        self._categorize_cached = lru_cache(maxsize=4096)(self._match_category)
+        
+        # Credit indicators
+        self._credit_keywords = ('received', 'credit', 'credited', 'from', 'refund', 'cashback')
+        # Debit indicators
+        self._debit_keywords = ('paid', 'debit', 'debited', 'payment', 'sent', 'transfer to')
+        self._direction_automaton = self._build_direction_automaton()
+    
+    def _build_keyword_automaton(self):
+        """
+        Build one Aho-Corasick automaton over all category keywords
+        
+        Each keyword maps to the position of the first category that lists it,
+        so the lowest match wins just like the ordered scan in _match_category.
+        Returns None if pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for priority, keywords in enumerate(self.category_keywords.values()):
+            for keyword in keywords:
+                if keyword not in automaton:
+                    automaton.add_word(keyword, priority)
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_direction_automaton(self):
+        """
+        Build an Aho-Corasick automaton over the credit and debit keywords
+        
+        Each keyword maps to (keyword, +1 for credit or -1 for debit). Matches
+        overlap, so 'credited' reports both 'credit' and 'credited' like the
+        substring checks do. Returns None if pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for sign, keywords in ((1, self._credit_keywords), (-1, self._debit_keywords)):
+            for keyword in keywords:
+                automaton.add_word(keyword, (keyword, sign))
+        automaton.make_automaton()
+        return automaton
     
-    def extract_transactions(self, raw_text: str) -> List[Dict]:
+    def extract_transactions(self, raw_text: str) -> List[Transaction]:
         """
         Extract structured transactions from raw text using pattern matching
         
@@ -34,81 +212,115 @@ class TransactionParser:
             raw_text: Raw OCR text from PDF
             
         Returns:
-            List of transaction dictionaries
+            List of Transaction objects
+        """
+        return self._extract_blocks(raw_text, close_last=True)[0]
+    
+    def _extract_blocks(self, raw_text: str, close_last: bool) -> Tuple[List[Transaction], List[str]]:
+        """
+        Extract transactions, optionally leaving the last block open
+        
+        Args:
+            raw_text: Raw OCR text from PDF
+            close_last: Whether the text ends the document. If not, a last
+                block shorter than TRANSACTION_WINDOW may continue in the
+                text that follows, so it is not extracted
+            
+        Returns:
+            Tuple of (transactions, lines of the block left open)
         """
         transactions = []
         lines = raw_text.split('\n')
         
         # Filter out page numbers and irrelevant lines
+        # (bound methods hoisted out of the per-line loops)
+        page_search = self._re_page.search
         filtered_lines = []
-        page_pattern = r'(?:page|pg)\s+\d+\s+of\s+\d+|^\d+\s+of\s+\d+$'
+        append_line = filtered_lines.append
         for line in lines:
             line_stripped = line.strip()
             # Skip empty lines, page numbers, and header/footer noise
             if (not line_stripped or 
-                re.search(page_pattern, line_stripped, re.IGNORECASE) or
-                line_stripped.lower() in ['phonepe', 'statement', 'transaction history', 'page']):
+                page_search(line_stripped) or
+                line_stripped.lower() in _NOISE_LINES):
                 continue
-            filtered_lines.append(line)
+            append_line(line)
         
         lines = filtered_lines
         
-        # Debug: Print first 20 lines to see what we're working with
-        print("\n=== DEBUG: First 20 lines of PDF text (after filtering) ===")
-        for idx, line in enumerate(lines[:20]):
-            print(f"{idx}: {line.strip()}")
-        print("=" * 50)
-        
-        # Enhanced transaction patterns
-        date_pattern = r'\b(\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})\b'
-        time_pattern = r'\b(\d{1,2}:\d{2}(?::\d{2})?(?:\s*[AP]M)?)\b'
-        # More flexible amount pattern
-        amount_pattern = r'(?:Rs\.?|INR|₹|Amount[:\s]*)\s*([0-9,]+(?:\.[0-9]{1,2})?)|([0-9,]+(?:\.[0-9]{1,2})?)\s*(?:Rs\.?|INR|₹)'
-        
-        i = 0
-        found_count = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Try to extract a transaction from current position
-            transaction = self._extract_single_transaction(lines, i, date_pattern, time_pattern, amount_pattern)
+        # Debug: Log first 20 lines to see what we're working with
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            log.debug("First 20 lines of PDF text (after filtering):")
+            for idx, line in enumerate(lines[:20]):
+                log.debug("%d: %s", idx, line.strip())
+        
+        # Each candidate transaction starts at a dated line and runs up to the
+        # next dated line (at most TRANSACTION_WINDOW lines), so every line is
+        # scanned once instead of once per overlapping lookahead window. The
+        # date matched here is the block's date, so blocks never re-scan for it
+        date_search = self._re_date.search
+        dated_lines = []
+        block_dates = []
+        for idx, line in enumerate(lines):
+            date_match = date_search(line)
+            if date_match:
+                dated_lines.append(idx)
+                block_dates.append(date_match.group(1))
+        dated_lines.append(len(lines))
+        
+        window = self.TRANSACTION_WINDOW
+        open_lines = []
+        if not close_last and block_dates and len(lines) - dated_lines[-2] < window:
+            open_lines = lines[dated_lines[-2]:]
+            block_dates.pop()
+            dated_lines.pop()
+        
+        extract = self._extract_single_transaction
+        validate = self._validate_transaction
+        time_re, amount_re = self._re_time, self._re_amount
+        for date_str, start, next_start in zip(block_dates, dated_lines, dated_lines[1:]):
+            context_lines = lines[start:min(next_start, start + window)]
+            transaction = extract(context_lines, date_str, time_re, amount_re)
             if transaction:
-                found_count += 1
-                print(f"\n✓ Found transaction #{found_count}: {transaction.get('merchant', 'Unknown')} - ₹{transaction.get('amount', 0)}")
-                transactions.append(self._validate_transaction(transaction))
-                i += 5  # Skip ahead to avoid duplicates
-            else:
-                i += 1
-        
-        print(f"\n=== Total transactions found: {len(transactions)} ===\n")
-        return transactions
+                if debug:
+                    log.debug("Found transaction #%d: %s - ₹%s", len(transactions) + 1,
+                              transaction.merchant, transaction.amount)
+                transactions.append(validate(transaction))
+        
+        log.debug("Total transactions found: %d", len(transactions))
+        return transactions, open_lines
     
-    def categorize_transactions(self, transactions: List[Dict]) -> List[Dict]:
+    def categorize_transactions(self, transactions: List[Transaction]) -> List[Transaction]:
         """
-        Add category field to transactions using keyword matching
+        Set the category of each transaction using keyword matching
         
         Args:
-            transactions: List of transaction dictionaries
+            transactions: List of Transaction objects
             
         Returns:
-            Transactions with added 'category' field
+            The same transactions with 'category' set
         """
         if not transactions:
             return []
         
+        # Lowercase once and go straight to the cached matcher
+        categorize = self._categorize_cached
         for transaction in transactions:
-            merchant = transaction.get('merchant', '').lower()
-            category = self._categorize_merchant(merchant)
-            transaction['category'] = category
+            transaction.category = categorize((transaction.merchant or '').lower())
         
         return transactions
     
     def _categorize_merchant(self, merchant: str) -> str:
-        """Categorize merchant based on keywords"""
-        merchant_lower = merchant.lower()
+        """Categorize merchant based on keywords (cached, merchants repeat a lot)"""
+        return self._categorize_cached(merchant.lower())
+    
+    def _match_category(self, merchant_lower: str) -> str:
+        """Find the category for an already lowercased merchant name"""
+        # Single pass over the merchant name when the automaton is available
+        if self._keyword_automaton is not None:
+            priority = min((p for _, p in self._keyword_automaton.iter(merchant_lower)), default=None)
+            return 'other' if priority is None else self._categories[priority]
         
         # Check each category's keywords
         for category, keywords in self.category_keywords.items():
@@ -128,214 +340,230 @@ class TransactionParser:
         Returns:
             Dictionary with 'transactions' and 'insights' keys
         """
-        # Extract transactions
-        transactions = self.extract_transactions(raw_text)
+        return self.process_pages([raw_text])
+    
+    def process_pages(self, pages: Iterable[str]) -> Dict:
+        """
+        Run extraction and categorization one page at a time
         
-        # Categorize transactions
-        categorized = self.categorize_transactions(transactions)
+        Args:
+            pages: Page texts in order, e.g. from PDFProcessor.iter_pages()
+            
+        Returns:
+            Dictionary with 'transactions' and 'insights' keys
+        """
+        transactions = []
+        # A block still open at the bottom of a page can continue on the next
+        # one (e.g. the date on page 1, merchant and amount on page 2), so its
+        # lines are parsed again in front of the next page's text. Only the
+        # block left open after the last page is closed where it ends
+        open_lines = []
+        for page_text in pages:
+            if open_lines:
+                page_text = '\n'.join(open_lines) + '\n' + page_text
+            page_transactions, open_lines = self._extract_blocks(page_text, close_last=False)
+            transactions.extend(self._to_dicts(page_transactions))
+        if open_lines:
+            transactions.extend(self.parse_page('\n'.join(open_lines)))
         
         return {
-            'transactions': categorized,
+            'transactions': transactions,
             'insights': None  # Will be generated separately
         }
     
-    def _extract_single_transaction(self, lines: List[str], start_idx: int, 
-                                    date_pattern: str, time_pattern: str, 
-                                    amount_pattern: str) -> Dict:
-        """Extract a single transaction from lines starting at index"""
-        transaction = {
-            'date': None,
-            'time': None,
-            'merchant': None,
-            'direction': 'debit',
-            'amount': 0.0,
-            'transaction_id': None,
-            'utr_number': None,
-            'account_reference': None
-        }
+    def parse_page(self, page_text: str) -> List[Dict]:
+        """
+        Extract and categorize the transactions on a single page
         
-        # Look ahead up to 10 lines for transaction data
-        end_idx = min(start_idx + 10, len(lines))
-        context_lines = lines[start_idx:end_idx]
-        context_text = ' '.join(context_lines)
+        Args:
+            page_text: Raw text of one PDF page
+            
+        Returns:
+            Categorized transaction dictionaries found on the page
+        """
+        return self._to_dicts(self.extract_transactions(page_text))
+    
+    def _to_dicts(self, transactions: List[Transaction]) -> List[Dict]:
+        """Categorize transactions and convert them to dicts"""
+        return [t.to_dict() for t in self.categorize_transactions(transactions)]
+    
+    def _extract_single_transaction(self, context_lines: List[str], date_str: str, 
+                                    time_re: re.Pattern, amount_re: re.Pattern) -> Optional[Transaction]:
+        """
+        Extract a single transaction from the lines of one candidate block
         
-        # Extract date
-        date_match = re.search(date_pattern, context_text)
-        if date_match:
-            transaction['date'] = self._normalize_date(date_match.group(1))
+        Args:
+            context_lines: Lines of the block, starting with its dated line
+            date_str: Date already matched on the first line
+            time_re: Compiled time pattern
+            amount_re: Compiled amount pattern
+            
+        Returns:
+            Transaction, or None if the block is not a transaction
+        """
+        transaction = Transaction()
         
-        # Extract time
-        time_match = re.search(time_pattern, context_text)
-        if time_match:
-            transaction['time'] = self._normalize_time(time_match.group(1))
+        context_text = ' '.join(context_lines)
+        # Text for the RE2-compiled amount, transaction ID and UTR patterns
+        scan_text = context_text.translate(_RE2_SPACES) if re2 is not None else context_text
         
-        # Extract amount
-        amount_match = re.search(amount_pattern, context_text, re.IGNORECASE)
-        if amount_match:
-            amount_str = amount_match.group(1) or amount_match.group(2)
-            transaction['amount'] = self._parse_amount(amount_str)
-        else:
+        # Extract the required amount first so blocks without one are
+        # rejected before the remaining field regexes run
+        amount_match = amount_re.search(scan_text)
+        if not amount_match:
             return None  # No amount, probably not a transaction
+        amount_str = amount_match.group(1) or amount_match.group(2)
+        transaction.amount = self._parse_amount(amount_str)
+        if transaction.amount <= 0:
+            return None
+        
+        transaction.date = self._normalize_date(date_str)
         
         # Extract merchant/recipient
         merchant = self._extract_merchant(context_lines)
         if merchant:
-            transaction['merchant'] = merchant
+            transaction.merchant = merchant
         else:
             return None  # No merchant, probably not a transaction
         
+        # Extract time
+        time_match = time_re.search(context_text)
+        if time_match:
+            transaction.time = self._normalize_time(time_match.group(1))
+        
         # Detect direction (credit or debit)
-        transaction['direction'] = self._detect_direction(context_text)
+        transaction.direction = self._detect_direction(context_text)
         
         # Extract transaction ID
-        txn_id = self._extract_pattern(context_text, r'(?:transaction|txn|trans|ref)\s*(?:id|no|number)?\s*[:=#]?\s*([A-Z0-9]{10,})', 1)
+        txn_id = self._extract_pattern(scan_text, self._re_txn_id, 1)
         if txn_id:
-            transaction['transaction_id'] = txn_id
+            transaction.transaction_id = txn_id
         
         # Extract UTR
-        utr = self._extract_pattern(context_text, r'(?:utr|ref\s*no)?\s*[:=#]?\s*([0-9]{12,})', 1)
+        utr = self._extract_pattern(scan_text, self._re_utr, 1)
         if utr:
-            transaction['utr_number'] = utr
+            transaction.utr_number = utr
         
         # Extract account reference
-        account = self._extract_pattern(context_text, r'(?:account|a/c)?\s*(?:xxxx|x{4})?(\d{4})', 1)
+        account = self._extract_pattern(context_text, self._re_account, 1)
         if account:
-            transaction['account_reference'] = account
+            transaction.account_reference = account
         
-        return transaction if transaction['date'] and transaction['amount'] > 0 else None
+        return transaction
     
-    def _validate_transaction(self, transaction: Dict) -> Dict:
+    def _validate_transaction(self, transaction: Transaction) -> Transaction:
         """Validate and clean a transaction object"""
         # Ensure required fields
-        required_fields = ['date', 'merchant', 'direction', 'amount']
-        for field in required_fields:
-            if field not in transaction or transaction[field] is None:
-                if field == 'direction':
-                    transaction[field] = 'debit'
-                elif field == 'amount':
-                    transaction[field] = 0.0
-                else:
-                    transaction[field] = ''
-        
-        # Ensure numeric amount
-        try:
-            transaction['amount'] = float(transaction['amount'])
-        except (ValueError, TypeError):
-            transaction['amount'] = 0.0
-        
-        # Ensure category exists
-        if 'category' not in transaction:
-            transaction['category'] = 'other'
+        for field, default in _REQUIRED_DEFAULTS:
+            if getattr(transaction, field) is None:
+                setattr(transaction, field, default)
         
-        # Add optional fields as null if missing
-        optional_fields = ['time', 'transaction_id', 'utr_number', 'account_reference']
-        for field in optional_fields:
-            if field not in transaction:
-                transaction[field] = None
+        # Ensure numeric amount (already a float for parsed rows)
+        if type(transaction.amount) is not float:
+            try:
+                transaction.amount = float(transaction.amount)
+            except (ValueError, TypeError):
+                transaction.amount = 0.0
         
         return transaction
     
-    def _normalize_date(self, date_str: str) -> str:
-        """Convert date to ISO format (yyyy-mm-dd)"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_date(date_str: str) -> str:
+        """Convert date to ISO format (yyyy-mm-dd), cached as statements repeat dates"""
+        from datetime import datetime
+        
+        stripped = date_str.strip()
+        match = _RE_DMY.match(stripped)
+        if match:
+            day, _, month, year = match.groups()
+            # Same two-digit year pivot as strptime's %y
+            year = int(year) if len(year) == 4 else int(year) + (2000 if int(year) <= 68 else 1900)
+        else:
+            match = _RE_YMD.match(stripped)
+            if not match:
+                return date_str
+            year, month, day = match.groups()
+            year = int(year)
+        
         try:
-            # Try different date formats
-            for fmt in ['%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d', '%d-%m-%y', '%d/%m/%y']:
-                try:
-                    dt = datetime.strptime(date_str.strip(), fmt)
-                    return dt.strftime('%Y-%m-%d')
-                except:
-                    continue
-            return date_str
-        except:
+            # Rejects impossible dates such as 31-02-2024
+            datetime(year, int(month), int(day))
+        except ValueError:
             return date_str
+        return f'{year:04d}-{int(month):02d}-{int(day):02d}'
     
-    def _normalize_time(self, time_str: str) -> str:
-        """Convert time to 24-hour format (HH:MM)"""
-        try:
-            time_str = time_str.strip().upper()
-            # Handle 12-hour format with AM/PM
-            if 'AM' in time_str or 'PM' in time_str:
-                for fmt in ['%I:%M %p', '%I:%M:%S %p']:
-                    try:
-                        dt = datetime.strptime(time_str, fmt)
-                        return dt.strftime('%H:%M')
-                    except:
-                        continue
-            # Already 24-hour format
-            else:
-                for fmt in ['%H:%M', '%H:%M:%S']:
-                    try:
-                        dt = datetime.strptime(time_str, fmt)
-                        return dt.strftime('%H:%M')
-                    except:
-                        continue
-            return time_str
-        except:
-            return time_str
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_time(time_str: str) -> str:
+        """Convert time to 24-hour format (HH:MM), cached as statements repeat times"""
+        time_str = time_str.strip().upper()
+        # Handle 12-hour format with AM/PM
+        if 'AM' in time_str or 'PM' in time_str:
+            match = _RE_TIME_12H.match(time_str)
+            if not match:
+                return time_str
+            hour, minute, meridiem = match.groups()
+            hour = int(hour) % 12 + (12 if meridiem == 'PM' else 0)
+        # Already 24-hour format
+        else:
+            match = _RE_TIME_24H.match(time_str)
+            if not match:
+                return time_str
+            hour, minute = match.groups()
+            hour = int(hour)
+        
+        return f'{hour:02d}:{int(minute):02d}'
     
     def _parse_amount(self, amount_str: str) -> float:
         """Parse amount string to float"""
         try:
             # Remove commas and any non-numeric characters except decimal point
-            clean_amount = re.sub(r'[^\d.]', '', amount_str)
+            clean_amount = amount_str.translate(_AMOUNT_KEEP)
             return float(clean_amount)
         except:
             return 0.0
     
     def _extract_merchant(self, lines: List[str]) -> str:
-        """Extract merchant/recipient name from lines"""
-        # Keywords that indicate merchant name (expanded list)
-        merchant_indicators = [
-            'to:', 'to ', 'merchant:', 'from:', 'recipient:', 'payee:', 
-            'paid to:', 'sent to:', 'received from:', 'transfer to:',
-            'payment to:', 'money sent to:'
-        ]
+        """
+        Extract merchant/recipient name from lines
         
-        # Invalid merchant patterns to skip
-        invalid_patterns = [
-            r'^\d{1,2}:\d{2}\s*(am|pm)',  # Time stamps like "10:21 PM"
-            r'^(transaction|txn|trans)\s*(id|no|number)',  # "Transaction ID"
-            r'^(utr|ref)\s*(no|number)',  # "UTR No"
-            r'^(debited|credited)\s*(from|to)',  # "Debited from"
-            r'^xx\d+',  # Account numbers like "XX7875"
-            r'^\d+$',  # Just numbers
-            r'^[a-z]{1,3}$',  # Single short words
-        ]
+        Returns at the first line that yields a name, which for the usual
+        layout is the dated first line itself ("Mar 11, 2024 Paid to ...").
+        """
+        invalid_merchant = self._re_invalid_merchant
+        has_indicator = self._re_merchant_indicator.search
         
         for line in lines:
             line_stripped = line.strip()
             line_lower = line_stripped.lower()
             
             # Skip if line matches invalid patterns
-            skip_line = False
-            for pattern in invalid_patterns:
-                if re.match(pattern, line_lower, re.IGNORECASE):
-                    skip_line = True
-                    break
-            
-            if skip_line:
+            if invalid_merchant.match(line_lower):
                 continue
             
-            # Check for merchant indicators
-            for indicator in merchant_indicators:
-                if indicator in line_lower:
+            # Check for merchant indicators (first in priority order wins)
+            if has_indicator(line_lower):
+                for indicator in self._merchant_indicators:
+                    if indicator not in line_lower:
+                        continue
                     # Extract text after indicator
                     idx = line_lower.find(indicator)
                     merchant = line_stripped[idx + len(indicator):].strip()
                     # Remove common suffixes
-                    merchant = re.sub(r'\s*(success|completed|failed|pending).*$', '', merchant, flags=re.IGNORECASE)
-                    merchant = re.sub(r'\s+', ' ', merchant)
-                    if len(merchant) > 2 and not any(re.match(p, merchant.lower()) for p in invalid_patterns):
+                    merchant = self._re_status_suffix.sub('', merchant)
+                    merchant = self._re_whitespace.sub(' ', merchant)
+                    if len(merchant) > 2 and not invalid_merchant.match(merchant.lower()):
                         return merchant[:100]
             
             # If line looks like a merchant name (not a label or number)
             if line_stripped and len(line_stripped) > 3:
-                if not line_lower.startswith(('date', 'time', 'amount', 'status', 'transaction', 'upi', 'ref', 'utr', 'debited', 'credited')):
-                    if not re.match(r'^[\d\s:/-]+$', line_stripped):  # Not just numbers/dates
+                if not line_lower.startswith(_LABEL_PREFIXES):
+                    if not self._re_numbers_only.match(line_stripped):  # Not just numbers/dates
                         # Check if it's not just a single word label
                         if ' ' in line_stripped or len(line_stripped) > 10:
                             # Final validation - must contain at least one letter
-                            if re.search(r'[a-zA-Z]{3,}', line_stripped):
+                            if self._re_word.search(line_stripped):
                                 return line_stripped[:100]
         
         return 'Unknown Merchant'
@@ -344,23 +572,23 @@ class TransactionParser:
         """Detect if transaction is debit or credit"""
         text_lower = text.lower()
         
-        # Credit indicators
-        credit_keywords = ['received', 'credit', 'credited', 'from', 'refund', 'cashback']
-        # Debit indicators
-        debit_keywords = ['paid', 'debit', 'debited', 'payment', 'sent', 'transfer to']
+        # Single pass: each distinct keyword found counts once, credit minus debit
+        if self._direction_automaton is not None:
+            found = {match for _, match in self._direction_automaton.iter(text_lower)}
+            return 'credit' if sum(sign for _, sign in found) > 0 else 'debit'
         
-        credit_count = sum(1 for keyword in credit_keywords if keyword in text_lower)
-        debit_count = sum(1 for keyword in debit_keywords if keyword in text_lower)
+        credit_count = sum(1 for keyword in self._credit_keywords if keyword in text_lower)
+        debit_count = sum(1 for keyword in self._debit_keywords if keyword in text_lower)
         
         if credit_count > debit_count:
             return 'credit'
         else:
             return 'debit'
     
-    def _extract_pattern(self, text: str, pattern: str, group: int) -> str:
-        """Extract text using regex pattern"""
+    def _extract_pattern(self, text: str, pattern: re.Pattern, group: int) -> str:
+        """Extract text using a compiled regex pattern"""
         try:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 return match.group(group).strip()
         except: